@@ -18,7 +18,9 @@ def main():
     """Start the development server"""
     logger.info("Starting Agent Coordinator Development Server...")
     
-    # Generate a test token for development
+    # Generate a test token for development. Keep this inside main(): the
+    # reloader's worker processes re-import this file as __mp_main__, so a
+    # module-level token would be re-signed on every reload.
     test_token = create_test_token()
     logger.info(f"Test JWT Token for development: {test_token}")
     logger.info("Use this token in the 'Authorization: Bearer <token>' header for API requests")
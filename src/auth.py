@@ -3,12 +3,20 @@ Authentication and Authorization Module
 Handles OAuth2 and user management
 """
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.types import ASGIApp, Receive, Scope, Send
+from cachetools import TTLCache
+from dataclasses import dataclass, field
+from types import MappingProxyType
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Annotated, Any, Mapping, Optional, Tuple
+import hashlib
+import jwt
 import logging
+import os
+import threading
+import time
 
 from .models import User
 
@@ -19,25 +27,75 @@ SECRET_KEY = "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-security = HTTPBearer()
+@dataclass(frozen=True)
+class _AuthConfig:
+    """JWT settings bound as a default argument so hot paths read a local"""
+    secret_key: str
+    algorithm: str
+    algorithms: Tuple[str, ...]
+    decode_options: Mapping[str, Any] = field(
+        default_factory=lambda: MappingProxyType({"require": ("exp", "sub")})
+    )
+
+_CONFIG = _AuthConfig(secret_key=SECRET_KEY, algorithm=ALGORITHM, algorithms=(ALGORITHM,))
+
+# Verified token payloads, keyed by token hash. The short TTL bounds how long a
+# revoked token can keep passing; "exp" is still re-checked on every hit.
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "5"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+_token_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+# Users built from those payloads, stored as (exp, user) under the same key
+_user_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+_token_cache_lock = threading.Lock()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    lifetime = expires_delta.total_seconds() if expires_delta else 15 * 60
+    to_encode.update({"exp": int(time.time() + lifetime)})
+    encoded_jwt = jwt.encode(to_encode, _CONFIG.secret_key, algorithm=_CONFIG.algorithm)
     return encoded_jwt
 
+# OpenSSL's SHA-256 uses the CPU's SHA extensions and beats BLAKE2 there; a
+# pure-software SHA-256 build is slower than blake2b, so fall back to that.
+if hashlib.sha256.__name__ == "openssl_sha256":
+    def _token_key(token: str) -> bytes:
+        """Cache key for a bearer token (never store the raw token)"""
+        return hashlib.sha256(token.encode()).digest()
+else:
+    def _token_key(token: str) -> bytes:
+        """Cache key for a bearer token (never store the raw token)"""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 def verify_token(token: str) -> dict:
     """Verify JWT token and return payload"""
+    return _verify_token(token, _token_key(token))
+
+def _verify_token(token: str, key: bytes, _cfg: _AuthConfig = _CONFIG) -> dict:
+    """Verify JWT token using a precomputed cache key"""
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        with _token_cache_lock:
+            _token_cache.pop(key, None)
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError as e:
+        # Reject expired tokens from the unverified claims first, so replayed
+        # expired tokens never cost an HMAC check
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        if isinstance(exp, (int, float)) and exp <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+
+        payload = jwt.decode(
+            token,
+            _cfg.secret_key,
+            algorithms=_cfg.algorithms,
+            options=_cfg.decode_options
+        )
+    except jwt.InvalidTokenError as e:
         logger.error(f"Token verification failed: {e}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,10 +103,20 @@ def verify_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
-    """Get current authenticated user"""
+    with _token_cache_lock:
+        _token_cache[key] = payload
+    return payload
+
+def authenticate_token(token: str) -> User:
+    """Resolve a bearer token to its user"""
+    key = _token_key(token)
+    with _token_cache_lock:
+        cached = _user_cache.get(key)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+
     try:
-        payload = verify_token(credentials.credentials)
+        payload = _verify_token(token, key)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -58,16 +126,19 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         
         # In production, fetch user from database
         # For now, create a mock user from token payload
+        now = datetime.utcnow()
         user = User(
             user_id=user_id,
             email=payload.get("email", "user@example.com"),
             name=payload.get("name", "Test User"),
             roles=payload.get("roles", ["user"]),
             is_admin=payload.get("is_admin", False),
-            created_at=datetime.utcnow(),
-            last_login=datetime.utcnow()
+            created_at=now,
+            last_login=now
         )
         
+        with _token_cache_lock:
+            _user_cache[key] = (payload.get("exp", 0), user)
         return user
         
     except HTTPException:
@@ -79,7 +150,54 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             detail="Could not validate credentials"
         )
 
-async def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+class JWTAuthMiddleware:
+    """
+    Pick the bearer token out of the request headers once and store it on
+    request.state. Verification is left to get_current_user, so routes that
+    never ask for a user (/health, /docs) never pay for or log a bad token
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["bearer_token"] = _bearer_token(scope)
+        await self.app(scope, receive, send)
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    """Extract the bearer token from the request headers, if there is one"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token
+            break
+    return None
+
+# Declares the bearer scheme in OpenAPI (the /docs Authorize button); it never
+# rejects a request, since get_current_user reports missing tokens itself
+security = HTTPBearer(auto_error=False)
+
+async def get_current_user(
+    request: Request,
+    _credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(security)] = None
+) -> User:
+    """Get current authenticated user"""
+    token = getattr(request.state, "bearer_token", None)
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return authenticate_token(token)
+
+# Use these aliases in route signatures so every endpoint and sub-dependency
+# shares one Depends(get_current_user) and FastAPI resolves it once per request
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+async def get_current_admin_user(current_user: CurrentUser) -> User:
     """Require admin privileges"""
     if not current_user.is_admin:
         raise HTTPException(
@@ -88,10 +206,10 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
         )
     return current_user
 
-def create_test_token() -> str:
+def create_test_token(subject: str = "test-user-123") -> str:
     """Create a test token for development/testing"""
     test_payload = {
-        "sub": "test-user-123",
+        "sub": subject,
         "email": "test@worzl.com",
         "name": "Test User",
         "roles": ["user", "admin"],
@@ -3,12 +3,19 @@ Client Storage Service Layer
 Handles integration with client card storage systems
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Mapping
 from enum import Enum
+from types import MappingProxyType
+import functools
 import logging
 from datetime import datetime
 import os
 
+import aiofiles
+import aiofiles.os
+import orjson
+from cachetools import TTLCache
+
 logger = logging.getLogger(__name__)
 
 class ClientStorageType(Enum):
@@ -19,6 +26,53 @@ class ClientStorageType(Enum):
     API_ENDPOINT = "api_endpoint"
     FIRESTORE = "firestore"
 
+# Storage-specific configuration, read from the environment only for the
+# backend that is actually selected
+_CONFIG_LOADERS: Dict[ClientStorageType, Callable[[], Dict[str, Any]]] = {
+    ClientStorageType.DATABASE: lambda: {
+        "connection_string": os.getenv("CLIENT_DB_CONNECTION_STRING", ""),
+        "table_name": os.getenv("CLIENT_DB_TABLE", "client_cards"),
+        "timeout": int(os.getenv("CLIENT_DB_TIMEOUT", "30"))
+    },
+    ClientStorageType.GRAPH_DB: lambda: {
+        "uri": os.getenv("CLIENT_GRAPH_URI", ""),
+        "username": os.getenv("CLIENT_GRAPH_USERNAME", ""),
+        "password": os.getenv("CLIENT_GRAPH_PASSWORD", ""),
+        "database": os.getenv("CLIENT_GRAPH_DATABASE", "client_cards")
+    },
+    ClientStorageType.API_ENDPOINT: lambda: {
+        "base_url": os.getenv("CLIENT_API_BASE_URL", ""),
+        "api_key": os.getenv("CLIENT_API_KEY", ""),
+        "timeout": int(os.getenv("CLIENT_API_TIMEOUT", "30"))
+    },
+    ClientStorageType.FIRESTORE: lambda: {
+        "project_id": os.getenv("GOOGLE_CLOUD_PROJECT", ""),
+        "collection_name": os.getenv("CLIENT_FIRESTORE_COLLECTION", "client_cards"),
+        "credentials_path": os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "")
+    },
+    ClientStorageType.JSON_FILES: lambda: {
+        "data_directory": os.getenv("CLIENT_DATA_DIRECTORY", "/app/data/clients"),
+        "file_pattern": os.getenv("CLIENT_FILE_PATTERN", "{client_id}.json"),
+        # No per-user access rules exist for files yet, so listing the directory
+        # grants every authenticated user every client; opt in explicitly
+        "list_all_files": os.getenv("CLIENT_FILES_VISIBLE_TO_ALL_USERS", "false").lower() == "true"
+    },
+}
+
+# Client IDs per user, shared by /clients and client access checks so one
+# storage round-trip answers both
+CLIENT_IDS_CACHE_TTL = int(os.getenv("CLIENT_IDS_CACHE_TTL", "30"))
+CLIENT_IDS_CACHE_SIZE = int(os.getenv("CLIENT_IDS_CACHE_SIZE", "10000"))
+_CLIENT_IDS_CACHE: TTLCache = TTLCache(maxsize=CLIENT_IDS_CACHE_SIZE, ttl=CLIENT_IDS_CACHE_TTL)
+
+# Mock client list served by the JSON file backend when it cannot list files
+_MOCK_CLIENT_IDS = ("promise_money", "client_2", "client_3")
+
+@functools.cache
+def _build_config(storage_type: ClientStorageType) -> Mapping[str, Any]:
+    """Read a backend's configuration once; the environment is fixed after startup"""
+    return MappingProxyType(_CONFIG_LOADERS[storage_type]())
+
 class ClientStorageService:
     """
     Client storage service with pluggable backends
@@ -28,6 +82,20 @@ class ClientStorageService:
     def __init__(self, storage_type: ClientStorageType = None):
         self.storage_type = storage_type or self._get_storage_type_from_env()
         self.config = self._load_storage_config()
+        self._get_impl = {
+            ClientStorageType.JSON_FILES: self._get_from_json_files,
+            ClientStorageType.DATABASE: self._get_from_database,
+            ClientStorageType.GRAPH_DB: self._get_from_graph_db,
+            ClientStorageType.API_ENDPOINT: self._get_from_api,
+            ClientStorageType.FIRESTORE: self._get_from_firestore,
+        }
+        self._list_impl = {
+            ClientStorageType.JSON_FILES: self._list_from_json_files,
+            ClientStorageType.DATABASE: self._list_from_database,
+            ClientStorageType.GRAPH_DB: self._list_from_graph_db,
+            ClientStorageType.API_ENDPOINT: self._list_from_api,
+            ClientStorageType.FIRESTORE: self._list_from_firestore,
+        }
         logger.info(f"Initialized client storage service with type: {self.storage_type.value}")
     
     def _get_storage_type_from_env(self) -> ClientStorageType:
@@ -40,46 +108,9 @@ class ClientStorageService:
             logger.warning(f"Unknown storage type: {storage_type}, defaulting to json_files")
             return ClientStorageType.JSON_FILES
     
-    def _load_storage_config(self) -> Dict[str, Any]:
+    def _load_storage_config(self) -> Mapping[str, Any]:
         """Load storage-specific configuration"""
-        config = {}
-        
-        if self.storage_type == ClientStorageType.DATABASE:
-            config = {
-                "connection_string": os.getenv("CLIENT_DB_CONNECTION_STRING", ""),
-                "table_name": os.getenv("CLIENT_DB_TABLE", "client_cards"),
-                "timeout": int(os.getenv("CLIENT_DB_TIMEOUT", "30"))
-            }
-        
-        elif self.storage_type == ClientStorageType.GRAPH_DB:
-            config = {
-                "uri": os.getenv("CLIENT_GRAPH_URI", ""),
-                "username": os.getenv("CLIENT_GRAPH_USERNAME", ""),
-                "password": os.getenv("CLIENT_GRAPH_PASSWORD", ""),
-                "database": os.getenv("CLIENT_GRAPH_DATABASE", "client_cards")
-            }
-        
-        elif self.storage_type == ClientStorageType.API_ENDPOINT:
-            config = {
-                "base_url": os.getenv("CLIENT_API_BASE_URL", ""),
-                "api_key": os.getenv("CLIENT_API_KEY", ""),
-                "timeout": int(os.getenv("CLIENT_API_TIMEOUT", "30"))
-            }
-        
-        elif self.storage_type == ClientStorageType.FIRESTORE:
-            config = {
-                "project_id": os.getenv("GOOGLE_CLOUD_PROJECT", ""),
-                "collection_name": os.getenv("CLIENT_FIRESTORE_COLLECTION", "client_cards"),
-                "credentials_path": os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "")
-            }
-        
-        elif self.storage_type == ClientStorageType.JSON_FILES:
-            config = {
-                "data_directory": os.getenv("CLIENT_DATA_DIRECTORY", "/app/data/clients"),
-                "file_pattern": os.getenv("CLIENT_FILE_PATTERN", "{client_id}.json")
-            }
-        
-        return config
+        return _build_config(self.storage_type)
     
     async def get_client_data(self, client_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -94,25 +125,7 @@ class ClientStorageService:
         logger.info(f"Fetching client data for: {client_id}")
         
         try:
-            if self.storage_type == ClientStorageType.JSON_FILES:
-                return await self._get_from_json_files(client_id)
-            
-            elif self.storage_type == ClientStorageType.DATABASE:
-                return await self._get_from_database(client_id)
-            
-            elif self.storage_type == ClientStorageType.GRAPH_DB:
-                return await self._get_from_graph_db(client_id)
-            
-            elif self.storage_type == ClientStorageType.API_ENDPOINT:
-                return await self._get_from_api(client_id)
-            
-            elif self.storage_type == ClientStorageType.FIRESTORE:
-                return await self._get_from_firestore(client_id)
-            
-            else:
-                logger.error(f"Unsupported storage type: {self.storage_type}")
-                return None
-                
+            return await self._get_impl[self.storage_type](client_id)
         except Exception as e:
             logger.error(f"Error fetching client data for {client_id}: {str(e)}")
             return None
@@ -127,39 +140,39 @@ class ClientStorageService:
         Returns:
             List of accessible client IDs
         """
+        key = (self.storage_type, user_id)
+        client_ids = _CLIENT_IDS_CACHE.get(key)
+        if client_ids is not None:
+            # Cached as a tuple; callers get their own list to change freely
+            return list(client_ids)
+        
         logger.info(f"Listing client IDs for user: {user_id}")
         
         try:
-            if self.storage_type == ClientStorageType.JSON_FILES:
-                return await self._list_from_json_files(user_id)
-            
-            elif self.storage_type == ClientStorageType.DATABASE:
-                return await self._list_from_database(user_id)
-            
-            elif self.storage_type == ClientStorageType.GRAPH_DB:
-                return await self._list_from_graph_db(user_id)
-            
-            elif self.storage_type == ClientStorageType.API_ENDPOINT:
-                return await self._list_from_api(user_id)
-            
-            elif self.storage_type == ClientStorageType.FIRESTORE:
-                return await self._list_from_firestore(user_id)
-            
-            else:
-                logger.error(f"Unsupported storage type: {self.storage_type}")
-                return []
-                
+            client_ids = await self._list_impl[self.storage_type](user_id)
         except Exception as e:
+            # Failures are not cached so the next request retries storage
             logger.error(f"Error listing client IDs: {str(e)}")
             return []
+        _CLIENT_IDS_CACHE[key] = tuple(client_ids)
+        return client_ids
     
     # IMPLEMENTATION PLACEHOLDERS
     # Replace these methods with actual implementations when you integrate with your client card system
     
     async def _get_from_json_files(self, client_id: str) -> Optional[Dict[str, Any]]:
-        """Placeholder: Get client data from JSON files"""
-        # TODO: Implement JSON file reading
-        logger.info(f"[PLACEHOLDER] Would read from JSON file for client: {client_id}")
+        """Get client data from JSON files, falling back to mock data"""
+        file_name = self.config["file_pattern"].format(client_id=client_id)
+        if os.path.basename(file_name) != file_name:
+            logger.warning(f"Rejected client ID with path components: {client_id}")
+            return None
+        
+        path = os.path.join(self.config["data_directory"], file_name)
+        if await aiofiles.os.path.isfile(path):
+            async with aiofiles.open(path, "rb") as f:
+                return orjson.loads(await f.read())
+        
+        logger.info(f"[PLACEHOLDER] No JSON file for client {client_id}, using mock data")
         
         # Mock data for testing
         return {
@@ -216,12 +229,30 @@ class ClientStorageService:
         return None
     
     async def _list_from_json_files(self, user_id: str = None) -> List[str]:
-        """Placeholder: List client IDs from JSON files"""
-        # TODO: Implement file system scanning
-        logger.info(f"[PLACEHOLDER] Would scan JSON files for user: {user_id}")
+        """
+        List client IDs from JSON files, falling back to a mock list
+        
+        The directory listing ignores user_id, so it is only used when
+        CLIENT_FILES_VISIBLE_TO_ALL_USERS is set; otherwise every user would be
+        granted every client file.
+        """
+        data_directory = self.config["data_directory"]
+        if not self.config["list_all_files"]:
+            logger.info(f"[PLACEHOLDER] Client file listing disabled, using mock list for user: {user_id}")
+            return list(_MOCK_CLIENT_IDS)
+        
+        if await aiofiles.os.path.isdir(data_directory):
+            prefix, _, suffix = self.config["file_pattern"].partition("{client_id}")
+            return sorted(
+                name[len(prefix):len(name) - len(suffix)]
+                for name in await aiofiles.os.listdir(data_directory)
+                if name.startswith(prefix) and name.endswith(suffix)
+                and len(name) > len(prefix) + len(suffix)
+            )
+        
+        logger.info(f"[PLACEHOLDER] No client data directory, using mock list for user: {user_id}")
         
-        # Mock client list
-        return ["promise_money", "client_2", "client_3"]
+        return list(_MOCK_CLIENT_IDS)
     
     async def _list_from_database(self, user_id: str = None) -> List[str]:
         """Placeholder: List client IDs from database"""
@@ -247,5 +278,7 @@ class ClientStorageService:
         logger.info(f"[PLACEHOLDER] Would query Firestore for user: {user_id}")
         return []
 
-# Global client storage service instance
-client_storage_service = ClientStorageService()
+@functools.lru_cache(maxsize=1)
+def get_client_storage_service() -> ClientStorageService:
+    """Return the shared client storage service, creating it on first use"""
+    return ClientStorageService()
@@ -3,105 +3,224 @@ Agent Coordinator - Core Logic
 Handles request routing and agent management
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, NamedTuple, Optional, Set, Tuple
 from datetime import datetime, timedelta
-import uuid
+from operator import attrgetter
 from .models import (
     CoordinationRequest, 
     CoordinationResponse, 
     AgentStatus,
-    AgentType,
     RoutingDecision,
     SystemHealth,
     QualityMetrics,
     User,
     AgentResponse,
-    AgentStatusEnum,
-    CoordinationRequestWithClient,
-    CoordinationResponseWithClient,
+    AgentStatusType,
     ClientContext,
-    ClientCardType
+    AgentRecord
 )
+from cachetools import TTLCache
+import asyncio
+import httpx
+import orjson
+import hashlib
 import logging
+import os
 import random
+import secrets
+import sys
+import time
 
 logger = logging.getLogger(__name__)
 
+# Finished ClientContext objects are cached per (user, client) for this long
+CLIENT_CONTEXT_CACHE_TTL = int(os.getenv("CLIENT_CONTEXT_CACHE_TTL", "300"))
+CLIENT_CONTEXT_CACHE_SIZE = int(os.getenv("CLIENT_CONTEXT_CACHE_SIZE", "10000"))
+
+# Complete coordination responses kept per user for repeated identical requests
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "4096"))
+
+# Connection pool shared by every agent call, so hops reuse keep-alive connections
+AGENT_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+AGENT_HTTP_TIMEOUT = 2.0
+
+class SimulatedSample(NamedTuple):
+    """Per-request simulated values, until real measurements replace them"""
+    total_processing_time: float
+    quality_score: float
+    agent_processing_time: float
+    success_rate: float
+
 class AgentCoordinator:
     """
     Main class responsible for coordinating agent requests
     """
 
+    __slots__ = (
+        "agents",
+        "http",
+        "_available",
+        "_available_ids",
+        "_agent_static",
+        "_routing_views",
+        "_status_cache",
+        "_quality_metrics",
+        "_client_context_cache",
+        "_response_cache",
+        "_rng",
+        "_simulated_metrics",
+        "_simulated_metrics_second",
+        "_health_bytes",
+        "_health_second",
+    )
+
     def __init__(self):
         # Example agent pool
-        self.agents = {
-            "content_research_agent": {
-                "type": AgentType.CONTENT_RESEARCH,
-                "status": AgentStatusEnum.HEALTHY,
-                "endpoint": "http://content-research-agent/api",
-                "last_health_check": datetime.utcnow(),
-                "current_load": 0,
-                "max_capacity": 100,
-                "average_response_time": 0.5
-            },
-            "technical_seo_agent": {
-                "type": AgentType.TECHNICAL_SEO,
-                "status": AgentStatusEnum.HEALTHY,
-                "endpoint": "http://technical-seo-agent/api",
-                "last_health_check": datetime.utcnow(),
-                "current_load": 0,
-                "max_capacity": 100,
-                "average_response_time": 0.5
-            }
+        now_ms = time.time_ns() // 1_000_000
+        self.agents: Dict[str, AgentRecord] = {
+            "content_research_agent": AgentRecord(
+                id="content_research_agent",
+                type="content_research",
+                status="healthy",
+                endpoint="http://content-research-agent/api",
+                last_health_check_ms=now_ms,
+                current_load=0,
+                max_capacity=100,
+                average_response_time=0.5
+            ),
+            "technical_seo_agent": AgentRecord(
+                id="technical_seo_agent",
+                type="technical_seo",
+                status="healthy",
+                endpoint="http://technical-seo-agent/api",
+                last_health_check_ms=now_ms,
+                current_load=0,
+                max_capacity=100,
+                average_response_time=0.5
+            )
             # Add more agents as needed
         }
+        # Every status and response is built from these registry strings via
+        # TrustedModel.build, so interning them once here is where it counts
+        for agent in self.agents.values():
+            agent.id = sys.intern(agent.id)
+            agent.endpoint = sys.intern(agent.endpoint)
+        # What routing hands out per agent: only identity, never mutable load/status
+        self._routing_views: Dict[str, Dict[str, Any]] = {
+            aid: {"id": aid, "type": agent.type}
+            for aid, agent in self.agents.items()
+        }
+        # Healthy agents with spare capacity, kept in sync on status and load
+        # changes so routing never rescans the whole pool
+        self._available: Set[str] = {
+            aid for aid, agent in self.agents.items()
+            if agent.status == "healthy"
+            and agent.current_load < agent.max_capacity
+        }
+        self._available_ids: Optional[Tuple[str, ...]] = None
+        # Status fields that never change after registration
+        self._agent_static: Dict[str, Dict[str, Any]] = {
+            aid: {
+                "agent_id": aid,
+                "agent_type": agent.type,
+                "max_capacity": agent.max_capacity,
+                "version": "1.0.0",
+                "endpoint_url": agent.endpoint
+            }
+            for aid, agent in self.agents.items()
+        }
+        # Last AgentStatus per agent, with the dynamic fields it was built from
+        self._status_cache: Dict[str, Tuple[Tuple[Any, ...], AgentStatus]] = {}
+        self._client_context_cache: TTLCache = TTLCache(
+            maxsize=CLIENT_CONTEXT_CACHE_SIZE, ttl=CLIENT_CONTEXT_CACHE_TTL
+        )
+        self._response_cache: TTLCache = TTLCache(
+            maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL
+        )
+        self._rng = random.Random()
+        self._simulated_metrics: Dict[str, Dict[str, Any]] = {}
+        self._simulated_metrics_second: Optional[int] = None
+        self._quality_metrics: Optional[Tuple[int, QualityMetrics]] = None
+        self._health_bytes = b""
+        self._health_second: Optional[int] = None
+        # Created in initialize() so the pool is bound to the running event loop
+        self.http: Optional[httpx.AsyncClient] = None
 
     async def initialize(self):
         """
         Perform any startup initialization
         """
         logger.info("Initializing agents...")
-        # Placeholder for any startup tasks
+        if self.http is None:
+            self.http = httpx.AsyncClient(limits=AGENT_HTTP_LIMITS, timeout=AGENT_HTTP_TIMEOUT)
 
     async def shutdown(self):
         """
         Perform any shutdown cleanup
         """
         logger.info("Cleaning up resources...")
-        # Placeholder for any cleanup tasks
+        if self.http is not None:
+            await self.http.aclose()
+            self.http = None
+
+    def get_health_bytes(self) -> bytes:
+        """
+        Serialized liveness payload, rebuilt at most once per second so probe
+        traffic is served from ready-made bytes
+        """
+        second = int(time.monotonic())
+        if second != self._health_second:
+            self._health_bytes = orjson.dumps(
+                {"status": "healthy", "timestamp": datetime.utcnow()}
+            )
+            self._health_second = second
+        return self._health_bytes
 
     async def get_system_health(self) -> SystemHealth:
         """
         Return detailed system health information
         """
-        return SystemHealth(
+        return SystemHealth.build(
             status="healthy",
-            timestamp=datetime.utcnow(),
+            timestamp_ms=time.time_ns() // 1_000_000,
             agents=[self._get_agent_status(agent_id) for agent_id in self.agents],
-            active_requests=sum(agent["current_load"] for agent in self.agents.values()),
-            total_requests_today=random.randint(0, 1000),  # Simulated value
-            average_response_time=random.uniform(0.1, 1.0),  # Simulated value
-            system_load=random.uniform(0.1, 1.0),  # Simulated value
-            uptime_percentage=99.9
+            active_requests=sum(agent.current_load for agent in self.agents.values()),
+            uptime_percentage=99.9,
+            **self._get_simulated_metrics()["health"]
         )
 
     async def process_request(self, request: CoordinationRequest, user: User) -> CoordinationResponse:
         """
         Main method for processing coordination requests
         """
-        request_id = str(uuid.uuid4())
+        request_id = secrets.token_hex(16)
+
+        # Identical requests from the same user reuse the stored response under
+        # a fresh request ID; responses are never shared across users
+        digest = hashlib.blake2b(request.model_dump_json().encode(), digest_size=16).hexdigest()
+        cache_key = f"{user.user_id}:{digest}"
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy(update={"request_id": request_id})
+
         routing_decision = self._route_request(request)
         agent_responses = await self._gather_agent_responses(routing_decision)
         synthesized_response = self._synthesize_responses(agent_responses)
+        sample = self._sim_sample()
 
-        return CoordinationResponse(
+        response = CoordinationResponse.build(
             request_id=request_id,
             routing_decision=routing_decision,
             agent_responses=agent_responses,
             synthesized_response=synthesized_response,
-            total_processing_time=random.uniform(0.1, 3.0),  # Simulated
-            quality_score=random.uniform(0.7, 1.0)  # Simulated quality score
+            total_processing_time=sample.total_processing_time,  # Simulated
+            quality_score=sample.quality_score  # Simulated quality score
         )
+        # A response missing a failed agent's answer must not be replayed
+        if len(agent_responses) == len(routing_decision["selected_agents"]):
+            self._response_cache[cache_key] = response
+        return response
 
     async def get_agent_status(self, agent_id: Optional[str] = None) -> List[AgentStatus]:
         """
@@ -112,92 +231,203 @@ class AgentCoordinator:
         else:
             return [self._get_agent_status(aid) for aid in self.agents]
 
+    async def get_one_agent_status(self, agent_id: str) -> Optional[AgentStatus]:
+        """
+        Get status of a single agent, or None if the agent is unknown
+        """
+        if agent_id not in self.agents:
+            return None
+        return self._get_agent_status(agent_id)
+
     def _route_request(self, request: CoordinationRequest) -> Dict[str, Any]:
         """
-        Handle intelligent request routing logic
+        Handle intelligent request routing logic. The selected agent's load is
+        taken here and held until its call finishes, so requests routed in the
+        meantime see it
         """
-        # Simple load balancing logic example
-        available_agents = [
-            aid for aid, agent in self.agents.items() 
-            if agent["status"] == AgentStatusEnum.HEALTHY and agent["current_load"] < agent["max_capacity"]
-        ]
-        selected_agent = random.choice(available_agents)  # Pick a random healthy agent
+        available = self._available_ids
+        if available is None:
+            available = self._available_ids = tuple(self._available)
+        if not available:
+            raise RuntimeError("No healthy agents with spare capacity")
 
-        return {"selected_agents": [self.agents[selected_agent]], "reasoning": "Random selection for demo."}
+        preferred = request._preferred_set
+        if preferred:
+            agents = self.agents
+            candidates = tuple(aid for aid in available if agents[aid].type in preferred)
+            if candidates:
+                selected_agent = self._pick_least_loaded(candidates)
+                self._acquire(selected_agent)
+                return {
+                    "selected_agents": [self._routing_views[selected_agent]],
+                    "reasoning": "Least-loaded preferred agent."
+                }
+
+        selected_agent = self._pick_least_loaded(available)
+        self._acquire(selected_agent)
+        return {"selected_agents": [self._routing_views[selected_agent]], "reasoning": "Least-loaded healthy agent."}
+
+    def _pick_least_loaded(self, agent_ids: Tuple[str, ...]) -> str:
+        """
+        Pick the agent with the lowest load relative to its capacity, breaking
+        ties at random so equally loaded agents share the traffic
+        """
+        agents = self.agents
+        best: List[str] = []
+        best_ratio = None
+        for aid in agent_ids:
+            agent = agents[aid]
+            ratio = agent.current_load / agent.max_capacity
+            if best_ratio is None or ratio < best_ratio:
+                best_ratio = ratio
+                best = [aid]
+            elif ratio == best_ratio:
+                best.append(aid)
+        return best[0] if len(best) == 1 else self._rng.choice(best)
 
     async def _gather_agent_responses(self, routing_decision: Dict[str, Any]) -> List[AgentResponse]:
         """
-        Gather responses from the selected agents
+        Gather responses from the selected agents concurrently
         """
-        # Simulated agent response
-        return [
-            AgentResponse(
-                agent_id=agent["type"].value,
-                agent_type=agent["type"],
-                response="Simulated response",
-                confidence=0.9,
-                processing_time=random.uniform(0.1, 1.0)
-            ) for agent in routing_decision["selected_agents"]
-        ]
+        agents = routing_decision["selected_agents"]
+        try:
+            results = await asyncio.gather(
+                *(self._call_agent(agent) for agent in agents),
+                return_exceptions=True
+            )
+        finally:
+            self._release_routed(agents)
+
+        return self._collect_agent_responses(agents, results)
+
+    def _collect_agent_responses(self, agents: List[Dict[str, Any]], results: List[Any]) -> List[AgentResponse]:
+        """
+        Keep successful agent responses; a failing agent should not sink the
+        whole coordination request
+        """
+        responses = []
+        for agent, result in zip(agents, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Agent {agent['type']} failed: {result}")
+            else:
+                responses.append(result)
+        return responses
+
+    async def _call_agent(self, agent: Dict[str, Any]) -> AgentResponse:
+        """
+        Call a single agent
+        """
+        # Simulated agent response (replace with self.http.post to agent["endpoint"])
+        return AgentResponse.build(
+            agent_id=agent["type"],
+            agent_type=agent["type"],
+            response="Simulated response",
+            confidence=0.9,
+            processing_time=self._sim_sample().agent_processing_time
+        )
 
     def _synthesize_responses(self, agent_responses: List[AgentResponse]) -> str:
         """
         Synthesize responses into a single cohesive output
         """
-        combined_responses = "\n".join([response.response for response in agent_responses])
+        combined_responses = "\n".join(map(attrgetter("response"), agent_responses))
         return f"Synthesized Response: \n{combined_responses}"
 
     def _get_agent_status(self, agent_id: str) -> AgentStatus:
         """
         Get the status of a specific agent
         """
-        agent = self.agents.get(agent_id)
-        if not agent:
+        static = self._agent_static.get(agent_id)
+        if static is None:
             raise ValueError("Agent not found")
 
-        return AgentStatus(
-            agent_id=agent_id,
-            agent_type=agent["type"],
-            status=agent["status"],
-            last_health_check=agent["last_health_check"],
-            current_load=agent["current_load"],
-            max_capacity=agent["max_capacity"],
-            average_response_time=agent["average_response_time"],
-            success_rate=random.uniform(0.8, 1.0),  # Simulated value
-            version="1.0.0",
-            endpoint_url=agent["endpoint"]
+        # Rebuild only when the agent's dynamic state has changed
+        agent = self.agents[agent_id]
+        key = (agent.current_load, agent.status, agent.last_health_check_ms)
+        cached = self._status_cache.get(agent_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # Inputs come from our own registry, so skip re-validating them
+        agent_status = AgentStatus.build(
+            status=agent.status,
+            last_health_check_ms=agent.last_health_check_ms,
+            current_load=agent.current_load,
+            average_response_time=agent.average_response_time,
+            success_rate=self._sim_sample().success_rate,  # Simulated value
+            **static
         )
+        self._status_cache[agent_id] = (key, agent_status)
+        return agent_status
 
     async def get_quality_metrics(self) -> QualityMetrics:
         """Get system quality metrics"""
-        return QualityMetrics(
-            response_accuracy=random.uniform(0.8, 1.0),
-            user_satisfaction=random.uniform(3.5, 5.0),
-            sla_compliance=random.uniform(0.95, 1.0),
-            error_rate=random.uniform(0.0, 0.05),
-            recommendation_acceptance=random.uniform(0.7, 0.9)
-        )
+        metrics = self._get_simulated_metrics()["quality"]
+        second = self._simulated_metrics_second
+        if self._quality_metrics is None or self._quality_metrics[0] != second:
+            self._quality_metrics = (second, QualityMetrics.build(**metrics))
+        return self._quality_metrics[1]
 
     async def get_performance_metrics(self) -> Dict[str, Any]:
         """Get detailed performance metrics"""
-        return {
-            "requests_per_minute": random.uniform(10, 100),
-            "average_response_time": random.uniform(0.1, 2.0),
-            "p95_response_time": random.uniform(1.0, 3.0),
-            "p99_response_time": random.uniform(2.0, 5.0),
-            "error_rate": random.uniform(0.0, 0.05),
-            "active_connections": random.randint(0, 50),
-            "memory_usage": random.uniform(0.3, 0.8),
-            "cpu_usage": random.uniform(0.2, 0.7)
-        }
+        return dict(self._get_simulated_metrics()["performance"])
+
+    def _sim_sample(self) -> SimulatedSample:
+        """
+        Draw all per-request simulated values from a single RNG call, using
+        16 random bits per value
+        """
+        bits = self._rng.getrandbits(64)
+        return SimulatedSample(
+            total_processing_time=0.1 + 2.9 * (bits & 0xFFFF) / 0x10000,
+            quality_score=0.7 + 0.3 * (bits >> 16 & 0xFFFF) / 0x10000,
+            agent_processing_time=0.1 + 0.9 * (bits >> 32 & 0xFFFF) / 0x10000,
+            success_rate=0.8 + 0.2 * (bits >> 48) / 0x10000
+        )
+
+    def _get_simulated_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Simulated health, quality and performance values, redrawn at most once
+        per second so frequent health probes reuse the same draw
+        """
+        second = int(time.monotonic())
+        if second != self._simulated_metrics_second:
+            uniform = self._rng.uniform
+            randint = self._rng.randint
+            self._simulated_metrics = {
+                "health": {
+                    "total_requests_today": randint(0, 1000),
+                    "average_response_time": uniform(0.1, 1.0),
+                    "system_load": uniform(0.1, 1.0)
+                },
+                "quality": {
+                    "response_accuracy": uniform(0.8, 1.0),
+                    "user_satisfaction": uniform(3.5, 5.0),
+                    "sla_compliance": uniform(0.95, 1.0),
+                    "error_rate": uniform(0.0, 0.05),
+                    "recommendation_acceptance": uniform(0.7, 0.9)
+                },
+                "performance": {
+                    "requests_per_minute": uniform(10, 100),
+                    "average_response_time": uniform(0.1, 2.0),
+                    "p95_response_time": uniform(1.0, 3.0),
+                    "p99_response_time": uniform(2.0, 5.0),
+                    "error_rate": uniform(0.0, 0.05),
+                    "active_connections": randint(0, 50),
+                    "memory_usage": uniform(0.3, 0.8),
+                    "cpu_usage": uniform(0.2, 0.7)
+                }
+            }
+            self._simulated_metrics_second = second
+        return self._simulated_metrics
 
     async def restart_agent(self, agent_id: str) -> bool:
         """Restart a specific agent"""
         if agent_id in self.agents:
             logger.info(f"Restarting agent {agent_id}")
             # In production, this would trigger actual agent restart
-            self.agents[agent_id]["status"] = AgentStatusEnum.HEALTHY
-            self.agents[agent_id]["current_load"] = 0
+            self.agents[agent_id].current_load = 0
+            self._set_agent_status(agent_id, "healthy")
             return True
         return False
 
@@ -205,15 +435,53 @@ class AgentCoordinator:
         """Enter system maintenance mode"""
         logger.info("Entering maintenance mode")
         for agent_id in self.agents:
-            self.agents[agent_id]["status"] = AgentStatusEnum.MAINTENANCE
+            self._set_agent_status(agent_id, "maintenance")
+
+    def _set_agent_status(self, agent_id: str, status: AgentStatusType):
+        """Update an agent's status and the available set used for routing"""
+        self.agents[agent_id].status = status
+        self._refresh_availability(agent_id)
+        # Stored responses reflect the old routing, so drop them
+        self._response_cache.clear()
+
+    def _acquire(self, agent_id: str):
+        """Count a request dispatched to an agent"""
+        self.agents[agent_id].current_load += 1
+        self._refresh_availability(agent_id)
+
+    def _release(self, agent_id: str):
+        """Count a request finished by an agent"""
+        agent = self.agents[agent_id]
+        # restart_agent may have reset the counter while we were in flight
+        agent.current_load = max(agent.current_load - 1, 0)
+        self._refresh_availability(agent_id)
+
+    def _release_routed(self, agents: List[Dict[str, Any]]):
+        """Give back the load taken when these agents were routed to"""
+        for agent in agents:
+            self._release(agent["id"])
+
+    def _refresh_availability(self, agent_id: str):
+        """Add or remove an agent from the available set after a state change"""
+        agent = self.agents[agent_id]
+        available = (
+            agent.status == "healthy"
+            and agent.current_load < agent.max_capacity
+        )
+        if available != (agent_id in self._available):
+            if available:
+                self._available.add(agent_id)
+            else:
+                self._available.discard(agent_id)
+            self._available_ids = None
     
     # CLIENT CONTEXT METHODS
     
     async def process_request_with_client(
         self, 
-        request: CoordinationRequestWithClient, 
+        request: CoordinationRequest, 
         user: User
-    ) -> CoordinationResponseWithClient:
+    ) -> CoordinationResponse:
         """Enhanced request processing with optional client context"""
         
         # Get client context if requested
@@ -221,8 +489,13 @@ class AgentCoordinator:
         if request.use_client_context and request.client_id:
             client_context = await self._get_client_context(request.client_id, user)
         
+        # Without context this is a plain coordination request, so reuse that
+        # (cached) path as is
+        if client_context is None:
+            return await self.process_request(request, user)
+        
         # Use existing processing with enhanced payload
-        request_id = str(uuid.uuid4())
+        request_id = secrets.token_hex(16)
         routing_decision = self._route_request(request)
         
         # Enhance agent responses with client context
@@ -232,18 +505,30 @@ class AgentCoordinator:
         )
         
         synthesized_response = self._synthesize_responses(agent_responses)
+        sample = self._sim_sample()
         
-        return CoordinationResponseWithClient(
+        return CoordinationResponse.build(
             request_id=request_id,
             routing_decision=routing_decision,
             agent_responses=agent_responses,
             synthesized_response=synthesized_response,
-            total_processing_time=random.uniform(0.1, 3.0),
-            quality_score=random.uniform(0.7, 1.0),
-            client_context_used=client_context is not None
+            total_processing_time=sample.total_processing_time,
+            quality_score=sample.quality_score,
+            client_context_used=True
         )
     
     async def _get_client_context(self, client_id: str, user: User) -> Optional[ClientContext]:
+        """Retrieve client context, cached per user and client"""
+        key = f"{user.user_id}:{client_id}"
+        client_context = self._client_context_cache.get(key)
+        if client_context is None:
+            # Misses are not cached, so newly granted access shows up at once
+            client_context = await self._load_client_context(client_id, user)
+            if client_context is not None:
+                self._client_context_cache[key] = client_context
+        return client_context
+    
+    async def _load_client_context(self, client_id: str, user: User) -> Optional[ClientContext]:
         """Retrieve client context with basic filtering"""
         
         # Validate user has access to this client
@@ -273,24 +558,35 @@ class AgentCoordinator:
     ) -> List[AgentResponse]:
         """Enhanced agent execution with client context"""
         
-        responses = []
-        for agent in routing_decision["selected_agents"]:
-            
-            # Prepare agent-specific context
-            agent_context = self._prepare_agent_context(agent, client_context)
-            
-            # Simulate agent call with context (replace with actual HTTP calls)
-            response = AgentResponse(
-                agent_id=agent["type"].value,
-                agent_type=agent["type"],
-                response=f"Response with context: {agent_context}",
-                confidence=0.9,
-                processing_time=random.uniform(0.1, 1.0),
-                metadata={"client_context_used": client_context is not None}
+        agents = routing_decision["selected_agents"]
+        try:
+            results = await asyncio.gather(
+                *(self._call_agent_with_context(agent, client_context) for agent in agents),
+                return_exceptions=True
             )
-            responses.append(response)
+        finally:
+            self._release_routed(agents)
+        return self._collect_agent_responses(agents, results)
+    
+    async def _call_agent_with_context(
+        self, 
+        agent: Dict[str, Any], 
+        client_context: Optional[ClientContext]
+    ) -> AgentResponse:
+        """Call a single agent with its filtered client context"""
         
-        return responses
+        # Prepare agent-specific context
+        agent_context = self._prepare_agent_context(agent, client_context)
+        
+        # Simulate agent call with context (replace with self.http.post to agent["endpoint"])
+        return AgentResponse.build(
+            agent_id=agent["type"],
+            agent_type=agent["type"],
+            response=f"Response with context: {agent_context}",
+            confidence=0.9,
+            processing_time=self._sim_sample().agent_processing_time,
+            metadata={"client_context_used": client_context is not None}
+        )
     
     def _prepare_agent_context(
         self, 
@@ -305,13 +601,13 @@ class AgentCoordinator:
         agent_type = agent["type"]
         
         # Agent-specific filtering rules
-        if agent_type == AgentType.CONTENT_RESEARCH:
+        if agent_type == "content_research":
             return {
                 "brand_voice": client_context.brand_voice,
                 "target_audience": client_context.target_audience,
                 "compliance_notes": client_context.compliance_notes
             }
-        elif agent_type == AgentType.TECHNICAL_SEO:
+        elif agent_type == "technical_seo":
             return {
                 "brand_voice": client_context.brand_voice.get("tone") if client_context.brand_voice else None,
                 "compliance_notes": client_context.compliance_notes
@@ -322,10 +618,10 @@ class AgentCoordinator:
     # Helper methods (implement based on your client card system)
     async def _validate_client_access(self, user: User, client_id: str) -> bool:
         """Validate user can access this client's data"""
-        from .client_storage import client_storage_service
+        from .client_storage import get_client_storage_service
         
         # Get list of clients this user can access
-        accessible_clients = await client_storage_service.list_client_ids(user.user_id)
+        accessible_clients = await get_client_storage_service().list_client_ids(user.user_id)
         
         if client_id in accessible_clients:
             logger.info(f"Access granted for user {user.user_id} to client {client_id}")
@@ -336,12 +632,13 @@ class AgentCoordinator:
     
     async def _fetch_client_data(self, client_id: str) -> Optional[Dict[str, Any]]:
         """Fetch client data from your card system"""
-        from .client_storage import client_storage_service
+        from .client_storage import get_client_storage_service
         
         logger.info(f"Fetching client data for {client_id}")
-        return await client_storage_service.get_client_data(client_id)
+        return await get_client_storage_service().get_client_data(client_id)
     
-    def _filter_brand_data(self, brand_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _filter_brand_data(brand_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Filter brand data for agent consumption"""
         if not brand_data:
             return None
@@ -353,7 +650,8 @@ class AgentCoordinator:
             "messaging_pillars": brand_data.get("messaging_pillars", [])
         }
     
-    def _filter_audience_data(self, audience_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _filter_audience_data(audience_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Filter audience data for agent consumption"""
         if not audience_data:
             return None
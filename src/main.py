@@ -3,11 +3,12 @@ Enterprise Agent Coordinator - Main Application
 A sophisticated orchestration system for managing distributed AI agents
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 import httpx
 import logging
+import os
 import time
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel, Field
@@ -16,15 +17,14 @@ import asyncio
 import uuid
 
 from .coordinator import AgentCoordinator
-from .auth import get_current_user, User
+from .auth import CurrentUser, JWTAuthMiddleware
 from .models import (
     CoordinationRequest, 
     CoordinationResponse, 
     AgentStatus, 
+    AGENT_STATUS_LIST,
     SystemHealth,
-    QualityMetrics,
-    CoordinationRequestWithClient,
-    CoordinationResponseWithClient
+    QualityMetrics
 )
 
 # Configure logging
@@ -37,7 +37,8 @@ app = FastAPI(
     description="Sophisticated orchestration system for distributed AI agents",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -49,9 +50,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Read the bearer token once per request; CurrentUser verifies it only on routes that need a user
+app.add_middleware(JWTAuthMiddleware)
+
 # Initialize the coordinator
 coordinator = AgentCoordinator()
 
+def model_response(model: BaseModel) -> Response:
+    """
+    Serialize an outbound model straight to JSON bytes with pydantic-core,
+    skipping FastAPI's response_model re-validation and jsonable_encoder pass
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize system on startup"""
@@ -65,38 +76,42 @@ async def shutdown_event():
     logger.info("Shutting down Agent Coordinator...")
     await coordinator.shutdown()
 
-@app.middleware("http")
+# Timing adds a middleware hop to every request, so it can be switched off
+PROCESS_TIME_HEADER = os.getenv("PROCESS_TIME_HEADER", "true").lower() == "true"
+
 async def add_process_time_header(request: Request, call_next):
     """Add processing time to response headers"""
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-Process-Time"] = f"{(time.perf_counter_ns() - start_ns) / 1e9:.6f}"
     return response
 
+if PROCESS_TIME_HEADER:
+    app.middleware("http")(add_process_time_header)
+
 # Health check endpoints
 @app.get("/health")
 async def health_check():
     """Basic health check"""
-    return {"status": "healthy", "timestamp": datetime.utcnow()}
+    return Response(content=coordinator.get_health_bytes(), media_type="application/json")
 
 @app.get("/health/detailed", response_model=SystemHealth)
 async def detailed_health_check():
     """Detailed system health check"""
-    return await coordinator.get_system_health()
+    return model_response(await coordinator.get_system_health())
 
 # Main coordination endpoints
 @app.post("/coordinate", response_model=CoordinationResponse)
 async def coordinate_request(
     request: CoordinationRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """
     Main coordination endpoint - routes requests to appropriate agents
     Implements 2-second routing decision SLA
     """
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Log the request
         logger.info(f"Coordination request from user {current_user.email}: {request.query[:100]}...")
@@ -105,11 +120,11 @@ async def coordinate_request(
         response = await coordinator.process_request(request, current_user)
         
         # Check SLA compliance
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         if processing_time > 2.0:
             logger.warning(f"SLA violation: Request took {processing_time:.2f}s (>2s)")
         
-        return response
+        return model_response(response)
         
     except Exception as e:
         logger.error(f"Coordination error: {str(e)}")
@@ -117,17 +132,17 @@ async def coordinate_request(
 
 # CLIENT-AWARE COORDINATION ENDPOINTS
 
-@app.post("/coordinate/client", response_model=CoordinationResponseWithClient)
+@app.post("/coordinate/client", response_model=CoordinationResponse)
 async def coordinate_request_with_client(
-    request: CoordinationRequestWithClient,
-    current_user: User = Depends(get_current_user)
+    request: CoordinationRequest,
+    current_user: CurrentUser
 ):
     """
     Client-aware coordination endpoint
     Processes requests with optional client context integration
     """
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         logger.info(f"Client-aware coordination request from {current_user.email} for client {request.client_id}")
         
@@ -135,11 +150,11 @@ async def coordinate_request_with_client(
         response = await coordinator.process_request_with_client(request, current_user)
         
         # Check SLA compliance
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         if processing_time > 2.0:
             logger.warning(f"SLA violation: Client request took {processing_time:.2f}s")
         
-        return response
+        return model_response(response)
         
     except Exception as e:
         logger.error(f"Client coordination error: {str(e)}")
@@ -148,7 +163,7 @@ async def coordinate_request_with_client(
 @app.get("/clients/{client_id}/context")
 async def get_client_context_preview(
     client_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """Preview what client context would be available"""
     try:
@@ -175,12 +190,12 @@ async def get_client_context_preview(
 
 @app.get("/clients")
 async def list_accessible_clients(
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """List client IDs accessible to the current user"""
     try:
-        from .client_storage import client_storage_service
-        client_ids = await client_storage_service.list_client_ids(current_user.user_id)
+        from .client_storage import get_client_storage_service
+        client_ids = await get_client_storage_service().list_client_ids(current_user.user_id)
         return {
             "client_ids": client_ids,
             "count": len(client_ids),
@@ -191,29 +206,30 @@ async def list_accessible_clients(
         raise HTTPException(status_code=500, detail="Failed to list accessible clients")
 
 @app.get("/agents/status", response_model=List[AgentStatus])
-async def get_agent_status(current_user: User = Depends(get_current_user)):
+async def get_agent_status(current_user: CurrentUser):
     """Get status of all agents in the system"""
-    return await coordinator.get_agent_status()
+    statuses = await coordinator.get_agent_status()
+    return Response(content=AGENT_STATUS_LIST.dump_json(statuses), media_type="application/json")
 
 @app.get("/agents/{agent_id}/status", response_model=AgentStatus)
 async def get_specific_agent_status(
     agent_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """Get status of a specific agent"""
-    status = await coordinator.get_agent_status(agent_id)
-    if not status:
+    status = await coordinator.get_one_agent_status(agent_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Agent not found")
-    return status
+    return model_response(status)
 
 # Quality and performance endpoints
 @app.get("/metrics/quality", response_model=QualityMetrics)
-async def get_quality_metrics(current_user: User = Depends(get_current_user)):
+async def get_quality_metrics(current_user: CurrentUser):
     """Get system quality metrics"""
-    return await coordinator.get_quality_metrics()
+    return model_response(await coordinator.get_quality_metrics())
 
 @app.get("/metrics/performance")
-async def get_performance_metrics(current_user: User = Depends(get_current_user)):
+async def get_performance_metrics(current_user: CurrentUser):
     """Get detailed performance metrics"""
     return await coordinator.get_performance_metrics()
 
@@ -221,7 +237,7 @@ async def get_performance_metrics(current_user: User = Depends(get_current_user)
 @app.post("/admin/agents/{agent_id}/restart")
 async def restart_agent(
     agent_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """Restart a specific agent (admin only)"""
     if not current_user.is_admin:
@@ -232,7 +248,7 @@ async def restart_agent(
 
 @app.post("/admin/system/maintenance")
 async def enter_maintenance_mode(
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """Enter system maintenance mode (admin only)"""
     if not current_user.is_admin:
@@ -246,7 +262,7 @@ async def enter_maintenance_mode(
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions with proper logging"""
     logger.error(f"HTTP error {exc.status_code}: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail, "timestamp": datetime.utcnow().isoformat()}
     )
@@ -255,7 +271,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
     logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -2,47 +2,71 @@
 Data models for the Enterprise Agent Coordinator
 """
 
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any, Union
-from datetime import datetime
-from enum import Enum
-
-class RequestPriority(str, Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    URGENT = "urgent"
-
-class AgentType(str, Enum):
-    CONTENT_RESEARCH = "content_research"
-    TECHNICAL_SEO = "technical_seo"
-    PROJECT_PLANNING = "project_planning"
-    BRD_GENERATION = "brd_generation"
-    SOCIAL_MEDIA = "social_media"
-
-class ClientCardType(str, Enum):
-    """Types of client cards for data filtering"""
-    BRAND_GUIDELINES = "brand_guidelines"
-    TARGET_AUDIENCE = "target_audience"
-    CLIENT_PROFILE = "client_profile"
-    CONTENT_BRIEF = "content_brief"
-
-class AgentStatusEnum(str, Enum):
-    HEALTHY = "healthy"
-    DEGRADED = "degraded"
-    UNAVAILABLE = "unavailable"
-    MAINTENANCE = "maintenance"
+from pydantic import (
+    BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, model_validator
+)
+from pydantic.dataclasses import dataclass as pydantic_dataclass
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Any, Tuple, Union, get_args
+from datetime import datetime, timezone
+
+# String tags are plain Literals so pydantic-core validates them with a single
+# string compare; the tuples are for code that needs to iterate the values
+RequestPriority = Literal["low", "medium", "high", "urgent"]
+PRIORITIES: Tuple[str, ...] = get_args(RequestPriority)
+
+AgentType = Literal[
+    "content_research",
+    "technical_seo",
+    "project_planning",
+    "brd_generation",
+    "social_media"
+]
+AGENT_TYPES: Tuple[str, ...] = get_args(AgentType)
+
+# Types of client cards for data filtering
+ClientCardType = Literal["brand_guidelines", "target_audience", "client_profile", "content_brief"]
+CLIENT_CARD_TYPES: Tuple[str, ...] = get_args(ClientCardType)
+
+AgentStatusType = Literal["healthy", "degraded", "unavailable", "maintenance"]
+AGENT_STATUSES: Tuple[str, ...] = get_args(AgentStatusType)
+
+def from_epoch_ms(value: int) -> datetime:
+    """Convert an epoch-milliseconds wire value to an aware UTC datetime"""
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+
+class TrustedModel(BaseModel):
+    """Base for outbound models the coordinator builds from its own data"""
+
+    # Outbound values are never edited after construction; derive copies instead
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    @classmethod
+    def build(cls, **fields: Any):
+        """Create an instance without validation; only for trusted, server-side data"""
+        return cls.model_construct(**fields)
 
 class CoordinationRequest(BaseModel):
     """Request model for agent coordination"""
     query: str = Field(..., description="User query to be processed")
-    priority: RequestPriority = Field(default=RequestPriority.MEDIUM, description="Request priority level")
+    priority: RequestPriority = Field(default="medium", description="Request priority level")
     context: Optional[Dict[str, Any]] = Field(default=None, description="Additional context for the request")
     preferred_agents: Optional[List[AgentType]] = Field(default=None, description="Preferred agents for processing")
     max_response_time: Optional[int] = Field(default=30, description="Maximum response time in seconds")
     require_multi_agent: Optional[bool] = Field(default=False, description="Whether to require multiple agents")
+    client_id: Optional[str] = Field(default=None, description="Client ID for context retrieval")
+    use_client_context: bool = Field(default=False, description="Whether to use client context")
+
+    # Preferred agent types as a set, built once at parse time for routing lookups
+    _preferred_set: Optional[frozenset] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _build_preferred_set(self) -> "CoordinationRequest":
+        if self.preferred_agents:
+            self._preferred_set = frozenset(self.preferred_agents)
+        return self
 
-class AgentResponse(BaseModel):
+class AgentResponse(TrustedModel):
     """Response from a single agent"""
     agent_id: str
     agent_type: AgentType
@@ -52,7 +76,7 @@ class AgentResponse(BaseModel):
     sources: Optional[List[str]] = Field(default=None, description="Sources used for the response")
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional metadata")
 
-class CoordinationResponse(BaseModel):
+class CoordinationResponse(TrustedModel):
     """Response from the coordination system"""
     request_id: str
     routing_decision: Dict[str, Any]
@@ -62,13 +86,14 @@ class CoordinationResponse(BaseModel):
     quality_score: float = Field(..., ge=0.0, le=1.0)
     recommendations: Optional[List[str]] = Field(default=None)
     next_actions: Optional[List[str]] = Field(default=None)
+    client_context_used: bool = Field(default=False, description="Whether client context was used in processing")
 
-class AgentStatus(BaseModel):
+class AgentStatus(TrustedModel):
     """Status information for an agent"""
     agent_id: str
     agent_type: AgentType
-    status: AgentStatusEnum
-    last_health_check: datetime
+    status: AgentStatusType
+    last_health_check_ms: int = Field(..., description="Last health check, epoch milliseconds")
     current_load: int = Field(..., ge=0, description="Current number of active requests")
     max_capacity: int = Field(..., ge=1, description="Maximum concurrent requests")
     average_response_time: float
@@ -76,10 +101,18 @@ class AgentStatus(BaseModel):
     version: str
     endpoint_url: str
 
-class SystemHealth(BaseModel):
+    @property
+    def last_health_check(self) -> datetime:
+        """Last health check as an aware UTC datetime"""
+        return from_epoch_ms(self.last_health_check_ms)
+
+# Built once at import; constructing adapters per call rebuilds the core schema
+AGENT_STATUS_LIST = TypeAdapter(List[AgentStatus])
+
+class SystemHealth(TrustedModel):
     """Overall system health status"""
     status: str
-    timestamp: datetime
+    timestamp_ms: int = Field(..., description="Snapshot time, epoch milliseconds")
     agents: List[AgentStatus]
     active_requests: int
     total_requests_today: int
@@ -87,7 +120,12 @@ class SystemHealth(BaseModel):
     system_load: float = Field(..., ge=0.0, le=1.0)
     uptime_percentage: float = Field(..., ge=0.0, le=100.0)
 
-class QualityMetrics(BaseModel):
+    @property
+    def timestamp(self) -> datetime:
+        """Timestamp as an aware UTC datetime"""
+        return from_epoch_ms(self.timestamp_ms)
+
+class QualityMetrics(TrustedModel):
     """Quality metrics for the system"""
     response_accuracy: float = Field(..., ge=0.0, le=1.0)
     user_satisfaction: float = Field(..., ge=0.0, le=5.0)
@@ -103,7 +141,8 @@ class RoutingDecision(BaseModel):
     confidence: float = Field(..., ge=0.0, le=1.0)
     fallback_agents: Optional[List[AgentType]] = Field(default=None)
 
-class WorkflowStep(BaseModel):
+@pydantic_dataclass(frozen=True, slots=True, kw_only=True)
+class WorkflowStep:
     """Individual step in a multi-agent workflow"""
     step_id: str
     agent_type: AgentType
@@ -112,6 +151,40 @@ class WorkflowStep(BaseModel):
     parameters: Dict[str, Any]
     estimated_duration: float
 
+class WorkflowStepsColumnar(BaseModel):
+    """Workflow steps stored column-wise, so scheduling passes touch only the columns they need"""
+    step_ids: List[str]
+    agent_types: List[AgentType]
+    agent_ids: List[str]
+    depends_on: List[List[str]]
+    durations: List[float]
+    parameters: List[Dict[str, Any]]
+
+    def dependency_order(self) -> List[str]:
+        """Step IDs in an order where every step follows its dependencies"""
+        index = {step_id: i for i, step_id in enumerate(self.step_ids)}
+        remaining = [len(deps) for deps in self.depends_on]
+        dependents: List[List[int]] = [[] for _ in self.step_ids]
+        for i, deps in enumerate(self.depends_on):
+            for dep in deps:
+                if dep not in index:
+                    raise ValueError(f"Step {self.step_ids[i]} depends on unknown step {dep}")
+                dependents[index[dep]].append(i)
+
+        ready = [i for i, count in enumerate(remaining) if count == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(self.step_ids[i])
+            for j in dependents[i]:
+                remaining[j] -= 1
+                if remaining[j] == 0:
+                    ready.append(j)
+
+        if len(order) != len(self.step_ids):
+            raise ValueError("Workflow steps contain a dependency cycle")
+        return order
+
 class MultiAgentWorkflow(BaseModel):
     """Definition of a multi-agent workflow"""
     workflow_id: str
@@ -122,6 +195,18 @@ class MultiAgentWorkflow(BaseModel):
     created_at: datetime
     created_by: str
 
+    def to_columnar(self) -> WorkflowStepsColumnar:
+        """Convert the steps to a columnar layout once, before scheduling"""
+        steps = self.steps
+        return WorkflowStepsColumnar.model_construct(
+            step_ids=[step.step_id for step in steps],
+            agent_types=[step.agent_type for step in steps],
+            agent_ids=[step.agent_id for step in steps],
+            depends_on=[step.depends_on or [] for step in steps],
+            durations=[step.estimated_duration for step in steps],
+            parameters=[step.parameters for step in steps]
+        )
+
 class User(BaseModel):
     """User model for authentication and authorization"""
     user_id: str
@@ -135,7 +220,7 @@ class User(BaseModel):
 class AuditLog(BaseModel):
     """Audit log entry"""
     log_id: str
-    timestamp: datetime
+    timestamp_ms: int = Field(..., description="Event time, epoch milliseconds")
     user_id: str
     action: str
     resource: str
@@ -143,9 +228,14 @@ class AuditLog(BaseModel):
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
 
+    @property
+    def timestamp(self) -> datetime:
+        """Timestamp as an aware UTC datetime"""
+        return from_epoch_ms(self.timestamp_ms)
+
 class PerformanceMetrics(BaseModel):
     """Detailed performance metrics"""
-    timestamp: datetime
+    timestamp_ms: int = Field(..., description="Sample time, epoch milliseconds")
     requests_per_minute: float
     average_response_time: float
     p95_response_time: float
@@ -154,24 +244,47 @@ class PerformanceMetrics(BaseModel):
     active_connections: int
     memory_usage: float
     cpu_usage: float
-    
-class CircuitBreakerState(BaseModel):
-    """Circuit breaker state for an agent"""
+
+    @property
+    def timestamp(self) -> datetime:
+        """Timestamp as an aware UTC datetime"""
+        return from_epoch_ms(self.timestamp_ms)
+
+@pydantic_dataclass(frozen=True, slots=True)
+class CircuitBreakerState:
+    """Circuit breaker state for an agent (transitions use dataclasses.replace)"""
     agent_id: str
     state: str  # CLOSED, OPEN, HALF_OPEN
     failure_count: int
-    last_failure_time: Optional[datetime] = None
-    next_attempt_time: Optional[datetime] = None
+    last_failure_time_ms: Optional[int] = None
+    next_attempt_time_ms: Optional[int] = None
     success_threshold: int = 5
     failure_threshold: int = 10
     timeout_duration: int = 60  # seconds
 
-# Client Context Models for Card Integration
+    @property
+    def last_failure_time(self) -> Optional[datetime]:
+        """Last failure time as an aware UTC datetime, if set"""
+        return None if self.last_failure_time_ms is None else from_epoch_ms(self.last_failure_time_ms)
 
-class CoordinationRequestWithClient(CoordinationRequest):
-    """Extended coordination request with client context"""
-    client_id: Optional[str] = Field(default=None, description="Client ID for context retrieval")
-    use_client_context: bool = Field(default=False, description="Whether to use client context")
+    @property
+    def next_attempt_time(self) -> Optional[datetime]:
+        """Next attempt time as an aware UTC datetime, if set"""
+        return None if self.next_attempt_time_ms is None else from_epoch_ms(self.next_attempt_time_ms)
+
+@dataclass(slots=True)
+class AgentRecord:
+    """Coordinator-internal registry entry for an agent (never serialized)"""
+    id: str
+    type: AgentType
+    status: AgentStatusType
+    endpoint: str
+    last_health_check_ms: int
+    current_load: int = 0
+    max_capacity: int = 100
+    average_response_time: float = 0.5
+
+# Client Context Models for Card Integration
 
 class ClientContext(BaseModel):
     """Simplified client context for agents"""
@@ -179,7 +292,3 @@ class ClientContext(BaseModel):
     brand_voice: Optional[Dict[str, Any]] = Field(default=None, description="Brand voice and tone guidelines")
     target_audience: Optional[Dict[str, Any]] = Field(default=None, description="Target audience information")
     compliance_notes: Optional[List[str]] = Field(default=None, description="Compliance requirements")
-    
-class CoordinationResponseWithClient(CoordinationResponse):
-    """Extended response with client context info"""
-    client_context_used: bool = Field(default=False, description="Whether client context was used in processing")
@@ -3,7 +3,8 @@
 Test API endpoints for client context integration
 """
 
-import requests
+import asyncio
+import httpx
 import json
 import time
 
@@ -11,32 +12,49 @@ import time
 BASE_URL = "http://localhost:8080"
 TEST_TOKEN = "your-test-token-here"  # Replace with actual test token
 
-def test_endpoints():
+async def test_endpoints():
     """Test the new client context API endpoints"""
-    
+
     headers = {
         "Authorization": f"Bearer {TEST_TOKEN}",
         "Content-Type": "application/json"
     }
-    
+
     print("🌐 Testing Client Context API Endpoints")
     print("=" * 50)
-    
-    # Test 1: Health check
-    print("\n1️⃣ Testing basic health check:")
-    try:
-        response = requests.get(f"{BASE_URL}/health")
-        print(f"   ✅ Status: {response.status_code}")
-        print(f"   ✅ Response: {response.json()}")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        print("   💡 Make sure the server is running: python run_dev.py")
-        return
-    
+
+    async with httpx.AsyncClient(base_url=BASE_URL, headers=headers, timeout=30.0) as client:
+        # Test 1: Health check
+        print("\n1️⃣ Testing basic health check:")
+        try:
+            response = await client.get("/health")
+            print(f"   ✅ Status: {response.status_code}")
+            print(f"   ✅ Response: {response.json()}")
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            print("   💡 Make sure the server is running: python run_dev.py")
+            return
+
+        # The remaining calls are independent, so issue them concurrently
+        context_result, client_result, regular_result = await asyncio.gather(
+            client.get("/clients/client_123/context"),
+            client.post("/coordinate/client", json={
+                "query": "Write a blog post about AI benefits for SMEs",
+                "client_id": "client_123",
+                "use_client_context": True,
+                "priority": "medium"
+            }),
+            client.post("/coordinate", json={
+                "query": "Write a blog post about AI",
+                "priority": "medium"
+            }),
+            return_exceptions=True
+        )
+
     # Test 2: Client context preview
     print("\n2️⃣ Testing client context preview:")
     try:
-        response = requests.get(f"{BASE_URL}/clients/client_123/context", headers=headers)
+        response = _raise_if_failed(context_result)
         print(f"   ✅ Status: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
@@ -46,18 +64,11 @@ def test_endpoints():
             print(f"   ✅ Preview: {data.get('preview')}")
     except Exception as e:
         print(f"   ❌ Error: {e}")
-    
+
     # Test 3: Client-aware coordination
     print("\n3️⃣ Testing client-aware coordination:")
     try:
-        payload = {
-            "query": "Write a blog post about AI benefits for SMEs",
-            "client_id": "client_123",
-            "use_client_context": True,
-            "priority": "medium"
-        }
-        
-        response = requests.post(f"{BASE_URL}/coordinate/client", headers=headers, json=payload)
+        response = _raise_if_failed(client_result)
         print(f"   ✅ Status: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
@@ -66,16 +77,11 @@ def test_endpoints():
             print(f"   ✅ Processing time: {data.get('total_processing_time'):.2f}s")
     except Exception as e:
         print(f"   ❌ Error: {e}")
-    
+
     # Test 4: Regular coordination (for comparison)
     print("\n4️⃣ Testing regular coordination:")
     try:
-        payload = {
-            "query": "Write a blog post about AI",
-            "priority": "medium"
-        }
-        
-        response = requests.post(f"{BASE_URL}/coordinate", headers=headers, json=payload)
+        response = _raise_if_failed(regular_result)
         print(f"   ✅ Status: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
@@ -83,12 +89,18 @@ def test_endpoints():
             print(f"   ✅ Processing time: {data.get('total_processing_time'):.2f}s")
     except Exception as e:
         print(f"   ❌ Error: {e}")
-    
+
     print("\n📋 API Testing Complete!")
     print("\n💡 To test manually:")
     print(f"   • Health: curl {BASE_URL}/health")
     print(f"   • Docs: {BASE_URL}/docs")
     print(f"   • Context: curl -H 'Authorization: Bearer {TEST_TOKEN}' {BASE_URL}/clients/client_123/context")
 
+def _raise_if_failed(result):
+    """Re-raise an exception captured by asyncio.gather"""
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
 if __name__ == "__main__":
-    test_endpoints()
+    asyncio.run(test_endpoints())
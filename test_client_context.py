@@ -9,7 +9,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.coordinator import AgentCoordinator
-from src.models import CoordinationRequestWithClient, User
+from src.models import CoordinationRequest, User
 from datetime import datetime
 
 async def test_client_context():
@@ -30,7 +30,7 @@ async def test_client_context():
     )
     
     # Create test request with client context
-    test_request = CoordinationRequestWithClient(
+    test_request = CoordinationRequest(
         query="Write a blog post about AI benefits for SMEs",
         client_id="client_123",
         use_client_context=True
@@ -41,7 +41,7 @@ async def test_client_context():
     
     # Test 1: Basic request without client context
     print("\n1️⃣ Testing without client context:")
-    basic_request = CoordinationRequestWithClient(
+    basic_request = CoordinationRequest(
         query="Write a blog post about AI",
         use_client_context=False
     )
@@ -73,7 +73,7 @@ async def test_client_context():
     
     # Test 4: Agent context filtering
     print("\n4️⃣ Testing agent context filtering:")
-    mock_agent = {"type": coordinator.agents["content_research_agent"]["type"]}
+    mock_agent = {"type": coordinator.agents["content_research_agent"].type}
     filtered_context = coordinator._prepare_agent_context(mock_agent, client_context)
     print(f"   ✅ Filtered context keys: {list(filtered_context.keys())}")
     print(f"   ✅ Brand voice included: {'brand_voice' in filtered_context}")
@@ -0,0 +1,136 @@
+"""
+Tests for token verification and authentication helpers
+"""
+
+import pytest
+from datetime import timedelta
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from src import auth
+from src.auth import (
+    CurrentUser,
+    JWTAuthMiddleware,
+    authenticate_token,
+    create_access_token,
+    create_test_token,
+    verify_token
+)
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with an empty verification cache"""
+    auth._token_cache.clear()
+    auth._user_cache.clear()
+    yield
+    auth._token_cache.clear()
+    auth._user_cache.clear()
+
+def test_verify_token_returns_payload():
+    """Test a valid token is decoded"""
+    payload = verify_token(create_test_token())
+    assert payload["sub"] == "test-user-123"
+
+def test_create_test_token_for_subject():
+    """Test test tokens can be minted for other subjects"""
+    assert verify_token(create_test_token("other-user"))["sub"] == "other-user"
+
+def test_verify_token_uses_cache(monkeypatch):
+    """Test repeated tokens skip signature verification"""
+    token = create_test_token()
+    first = verify_token(token)
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("jwt.decode should not run on a cache hit")
+
+    monkeypatch.setattr(auth.jwt, "decode", fail_decode)
+    assert verify_token(token) is first
+
+def test_verify_token_rechecks_expiry_on_cache_hit(monkeypatch):
+    """Test cached payloads past their exp fall back to full verification"""
+    token = create_test_token()
+    verify_token(token)
+    monkeypatch.setattr(auth.time, "time", lambda: 2 ** 40)
+
+    def expired_decode(*args, **kwargs):
+        raise auth.jwt.ExpiredSignatureError("Signature has expired")
+
+    monkeypatch.setattr(auth.jwt, "decode", expired_decode)
+    with pytest.raises(HTTPException) as exc_info:
+        verify_token(token)
+    assert exc_info.value.status_code == 401
+    assert len(auth._token_cache) == 0
+
+def test_verify_token_does_not_cache_failures():
+    """Test invalid tokens are rejected and never cached"""
+    token = create_access_token({"sub": "test"}, timedelta(minutes=5)) + "x"
+
+    with pytest.raises(HTTPException):
+        verify_token(token)
+    assert len(auth._token_cache) == 0
+
+def test_verify_token_rejects_expired_before_signature_check(monkeypatch):
+    """Test expired tokens are rejected without verifying the signature"""
+    token = create_access_token({"sub": "test"}, timedelta(minutes=-5))
+    decode = auth.jwt.decode
+
+    def unverified_decode_only(*args, **kwargs):
+        assert kwargs.get("options", {}).get("verify_signature") is False
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", unverified_decode_only)
+    with pytest.raises(HTTPException) as exc_info:
+        verify_token(token)
+    assert exc_info.value.status_code == 401
+
+@pytest.fixture
+def client():
+    """Fixture to create an app protected by the auth middleware"""
+    app = FastAPI()
+    app.add_middleware(JWTAuthMiddleware)
+
+    @app.get("/me")
+    async def me(current_user: CurrentUser):
+        return {"user_id": current_user.user_id}
+
+    @app.get("/public")
+    async def public():
+        return {"status": "ok"}
+
+    return TestClient(app)
+
+def test_authenticate_token_reuses_cached_user():
+    """Test the same token resolves to the same User instance"""
+    token = create_test_token()
+    first = authenticate_token(token)
+    second = authenticate_token(token)
+
+    assert first.user_id == "test-user-123"
+    assert first.is_admin
+    assert second is first
+
+def test_middleware_authenticates_bearer_token(client):
+    """Test routes receive the user resolved by the middleware"""
+    response = client.get("/me", headers={"Authorization": f"Bearer {create_test_token()}"})
+    assert response.status_code == 200
+    assert response.json() == {"user_id": "test-user-123"}
+
+def test_middleware_rejects_missing_or_invalid_token(client):
+    """Test protected routes fail without valid credentials"""
+    assert client.get("/me").status_code == 401
+    assert client.get("/me", headers={"Authorization": "Bearer invalid"}).status_code == 401
+
+def test_middleware_leaves_public_routes_open(client, monkeypatch):
+    """Test routes without CurrentUser never verify the token"""
+    def fail_authenticate(token):
+        raise AssertionError("public routes should not verify tokens")
+
+    monkeypatch.setattr(auth, "authenticate_token", fail_authenticate)
+    response = client.get("/public", headers={"Authorization": "Bearer invalid"})
+    assert response.status_code == 200
+
+def test_openapi_declares_bearer_scheme(client):
+    """Test protected routes advertise the bearer scheme for /docs"""
+    schema = client.get("/openapi.json").json()
+    assert schema["components"]["securitySchemes"]["HTTPBearer"]["scheme"] == "bearer"
+    assert schema["paths"]["/me"]["get"]["security"] == [{"HTTPBearer": []}]
+    assert "security" not in schema["paths"]["/public"]["get"]
@@ -0,0 +1,67 @@
+"""
+Tests for the client storage service
+"""
+
+import pytest
+from src.client_storage import ClientStorageService, ClientStorageType, _CLIENT_IDS_CACHE, _build_config
+
+@pytest.fixture
+def json_storage(tmp_path, monkeypatch):
+    """Fixture to create a JSON file storage service backed by a temp directory"""
+    monkeypatch.setenv("CLIENT_DATA_DIRECTORY", str(tmp_path))
+    _build_config.cache_clear()
+    _CLIENT_IDS_CACHE.clear()
+    (tmp_path / "acme.json").write_bytes(b'{"client_id": "acme", "compliance_requirements": ["GDPR compliant"]}')
+    (tmp_path / "globex.json").write_bytes(b'{"client_id": "globex"}')
+    (tmp_path / "notes.txt").write_bytes(b"not a client")
+    yield ClientStorageService(ClientStorageType.JSON_FILES)
+    _build_config.cache_clear()
+    _CLIENT_IDS_CACHE.clear()
+
+@pytest.mark.asyncio
+async def test_get_client_data_reads_json_file(json_storage):
+    """Test client data is read from the client's JSON file"""
+    data = await json_storage.get_client_data("acme")
+    assert data == {"client_id": "acme", "compliance_requirements": ["GDPR compliant"]}
+
+@pytest.mark.asyncio
+async def test_get_client_data_rejects_path_components(json_storage):
+    """Test client IDs cannot escape the data directory"""
+    assert await json_storage.get_client_data("../acme") is None
+
+@pytest.fixture
+def shared_json_storage(json_storage, monkeypatch):
+    """Fixture for JSON file storage with the directory listing opted in"""
+    monkeypatch.setenv("CLIENT_FILES_VISIBLE_TO_ALL_USERS", "true")
+    _build_config.cache_clear()
+    return ClientStorageService(ClientStorageType.JSON_FILES)
+
+@pytest.mark.asyncio
+async def test_list_client_ids_ignores_files_by_default(json_storage, caplog):
+    """Test client files are not granted to every user without opting in"""
+    with caplog.at_level("INFO", logger="src.client_storage"):
+        assert await json_storage.list_client_ids("test-123") == ["promise_money", "client_2", "client_3"]
+    assert "listing disabled" in caplog.text
+    assert "No client data directory" not in caplog.text
+
+@pytest.mark.asyncio
+async def test_list_client_ids_scans_json_files(shared_json_storage):
+    """Test client IDs are derived from matching file names"""
+    assert await shared_json_storage.list_client_ids("test-123") == ["acme", "globex"]
+
+@pytest.mark.asyncio
+async def test_list_client_ids_cached_per_user(shared_json_storage, tmp_path):
+    """Test repeated listings for a user are served from the cache"""
+    first = await shared_json_storage.list_client_ids("test-123")
+    (tmp_path / "initech.json").write_bytes(b'{"client_id": "initech"}')
+
+    assert await shared_json_storage.list_client_ids("test-123") == first
+    assert await shared_json_storage.list_client_ids("other-user") == ["acme", "globex", "initech"]
+
+@pytest.mark.asyncio
+async def test_list_client_ids_result_is_callers_own(shared_json_storage):
+    """Test changing a returned listing does not leak into the cache"""
+    first = await shared_json_storage.list_client_ids("test-123")
+    first.append("initech")
+
+    assert await shared_json_storage.list_client_ids("test-123") == ["acme", "globex"]
@@ -3,14 +3,35 @@ Tests for the Agent Coordinator core logic
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
+import json
+import sys
 from datetime import datetime
+from types import SimpleNamespace
 from src.coordinator import AgentCoordinator
-from src.models import CoordinationRequest, User, RequestPriority
+from src.models import (
+    ClientContext, CoordinationRequest, User
+)
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Session-wide event loop, needed by the session-scoped async fixture"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="session")
+async def initialized_coordinator():
+    """Coordinator initialized once and shared by tests that leave its state alone"""
+    coordinator = AgentCoordinator()
+    await coordinator.initialize()
+    yield coordinator
+    await coordinator.shutdown()
 
 @pytest.fixture
 def coordinator():
-    """Fixture to create a coordinator instance"""
+    """Fixture to create a fresh coordinator for tests that change its state"""
     return AgentCoordinator()
 
 @pytest.fixture
@@ -30,20 +51,22 @@ def test_request():
     """Fixture to create a test coordination request"""
     return CoordinationRequest(
         query="What are the latest SEO trends?",
-        priority=RequestPriority.MEDIUM
+        priority="medium"
     )
 
 @pytest.mark.asyncio
-async def test_coordinator_initialization(coordinator):
+async def test_coordinator_initialization(initialized_coordinator):
     """Test coordinator initialization"""
-    await coordinator.initialize()
-    assert len(coordinator.agents) > 0
+    assert len(initialized_coordinator.agents) > 0
+    assert initialized_coordinator.http is not None
 
 @pytest.mark.asyncio
 async def test_process_request(coordinator, test_request, test_user):
     """Test basic request processing"""
+    # Processing fills the response cache, so use a coordinator of its own
     await coordinator.initialize()
     response = await coordinator.process_request(test_request, test_user)
+    await coordinator.shutdown()
     
     assert response.request_id is not None
     assert response.synthesized_response is not None
@@ -51,25 +74,261 @@ async def test_process_request(coordinator, test_request, test_user):
     assert response.quality_score >= 0.0 and response.quality_score <= 1.0
 
 @pytest.mark.asyncio
-async def test_get_system_health(coordinator):
+async def test_process_request_reuses_cached_response(coordinator, test_request, test_user):
+    """Test identical requests are answered from the response cache"""
+    first = await coordinator.process_request(test_request, test_user)
+    second = await coordinator.process_request(test_request, test_user)
+
+    assert second.request_id != first.request_id
+    assert second.synthesized_response == first.synthesized_response
+    assert second.quality_score == first.quality_score
+
+    await coordinator.enter_maintenance_mode()
+    assert len(coordinator._response_cache) == 0
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_failed_agents(coordinator, test_request, test_user, monkeypatch):
+    """Test responses missing an agent's answer are not replayed"""
+    async def failing_call_agent(self, agent):
+        raise TimeoutError("agent timed out")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(AgentCoordinator, "_call_agent", failing_call_agent)
+        degraded = await coordinator.process_request(test_request, test_user)
+    assert degraded.agent_responses == []
+    assert len(coordinator._response_cache) == 0
+
+    recovered = await coordinator.process_request(test_request, test_user)
+    assert len(recovered.agent_responses) == 1
+
+@pytest.mark.asyncio
+async def test_response_cache_is_per_user(coordinator, test_request, test_user):
+    """Test one user's cached response is not served to another user"""
+    other_user = test_user.model_copy(update={"user_id": "other-456"})
+    await coordinator.process_request(test_request, test_user)
+    await coordinator.process_request(test_request, other_user)
+
+    assert len(coordinator._response_cache) == 2
+
+@pytest.mark.asyncio
+async def test_get_system_health(initialized_coordinator):
     """Test system health check"""
-    await coordinator.initialize()
-    health = await coordinator.get_system_health()
+    health = await initialized_coordinator.get_system_health()
     
     assert health.status == "healthy"
     assert len(health.agents) > 0
     assert health.uptime_percentage > 0
 
 @pytest.mark.asyncio
-async def test_get_agent_status(coordinator):
+async def test_get_agent_status(initialized_coordinator):
     """Test agent status retrieval"""
-    await coordinator.initialize()
-    statuses = await coordinator.get_agent_status()
+    statuses = await initialized_coordinator.get_agent_status()
     
     assert len(statuses) > 0
     for status in statuses:
         assert status.agent_id is not None
         assert status.agent_type is not None
 
+@pytest.mark.asyncio
+async def test_get_one_agent_status(coordinator):
+    """Test single-agent status lookup and unknown agents"""
+    status = await coordinator.get_one_agent_status("technical_seo_agent")
+    assert status.agent_id == "technical_seo_agent"
+    assert await coordinator.get_one_agent_status("missing_agent") is None
+
+@pytest.mark.asyncio
+async def test_simulated_metrics_reused_within_a_second(coordinator, monkeypatch):
+    """Test simulated metrics are drawn once per second"""
+    clock = iter([100.2, 100.7, 101.1])
+    monkeypatch.setattr("src.coordinator.time", SimpleNamespace(monotonic=lambda: next(clock)))
+
+    first = await coordinator.get_performance_metrics()
+    second = await coordinator.get_performance_metrics()
+    third = await coordinator.get_performance_metrics()
+
+    assert first == second
+    assert third != first
+
+def test_health_bytes_reused_within_a_second(coordinator, monkeypatch):
+    """Test the liveness payload is serialized once per second"""
+    clock = SimpleNamespace(monotonic=lambda: 100.2)
+    monkeypatch.setattr("src.coordinator.time", clock)
+    first = coordinator.get_health_bytes()
+    assert coordinator.get_health_bytes() is first
+    assert json.loads(first)["status"] == "healthy"
+
+    clock.monotonic = lambda: 101.0
+    assert coordinator.get_health_bytes() is not first
+
+@pytest.mark.asyncio
+async def test_routing_follows_agent_status(coordinator, test_request):
+    """Test routing only selects agents that are healthy"""
+    await coordinator.enter_maintenance_mode()
+    assert await coordinator.restart_agent("technical_seo_agent")
+
+    for _ in range(10):
+        decision = coordinator._route_request(test_request)
+        assert [a["id"] for a in decision["selected_agents"]] == ["technical_seo_agent"]
+
+def test_agent_status_uses_interned_registry_strings(coordinator):
+    """Test built statuses carry the registry's interned identifier strings"""
+    status = coordinator._get_agent_status("technical_seo_agent")
+    assert status.endpoint_url is sys.intern("".join(["http://", "technical-seo-agent/api"]))
+    assert status.agent_id is sys.intern("".join(["technical_seo", "_agent"]))
+
+@pytest.mark.asyncio
+async def test_agent_status_rebuilt_only_on_state_change(coordinator):
+    """Test agent statuses are reused until the agent's state changes"""
+    first = coordinator._get_agent_status("content_research_agent")
+    assert coordinator._get_agent_status("content_research_agent") is first
+
+    await coordinator.enter_maintenance_mode()
+    updated = coordinator._get_agent_status("content_research_agent")
+    assert updated is not first
+    assert updated.status == "maintenance"
+
+@pytest.mark.asyncio
+async def test_client_context_cached_per_user_and_client(coordinator, test_user, monkeypatch):
+    """Test client context is loaded once per user and client"""
+    loads = []
+
+    async def load_client_context(self, client_id, user):
+        loads.append(client_id)
+        return ClientContext(client_id=client_id)
+
+    monkeypatch.setattr(AgentCoordinator, "_load_client_context", load_client_context)
+    first = await coordinator._get_client_context("promise_money", test_user)
+    second = await coordinator._get_client_context("promise_money", test_user)
+
+    assert second is first
+    assert loads == ["promise_money"]
+
+@pytest.mark.asyncio
+async def test_context_agents_called_concurrently(coordinator, monkeypatch):
+    """Test context-aware agent calls overlap and release capacity"""
+    agents = list(coordinator._routing_views.values())
+    decision = {"selected_agents": agents}
+    context = ClientContext(client_id="promise_money")
+    for agent in agents:
+        coordinator._acquire(agent["id"])
+
+    # Each call waits until every call has started, which only happens if
+    # they run at the same time; one after another they would time out
+    started = []
+    all_started = asyncio.Event()
+    call_agent_with_context = AgentCoordinator._call_agent_with_context
+
+    async def overlapping_call(self, agent, client_context):
+        started.append(agent["id"])
+        if len(started) == len(agents):
+            all_started.set()
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+        return await call_agent_with_context(self, agent, client_context)
+
+    monkeypatch.setattr(AgentCoordinator, "_call_agent_with_context", overlapping_call)
+    responses = await coordinator._gather_agent_responses_with_context(decision, context)
+
+    assert [r.agent_id for r in responses] == [a["type"] for a in agents]
+    assert all(r.metadata == {"client_context_used": True} for r in responses)
+    assert all(a.current_load == 0 for a in coordinator.agents.values())
+
+@pytest.mark.asyncio
+async def test_http_client_shared_until_shutdown(coordinator):
+    """Test one pooled HTTP client lives from initialize to shutdown"""
+    await coordinator.initialize()
+    client = coordinator.http
+    await coordinator.initialize()
+    assert coordinator.http is client
+
+    await coordinator.shutdown()
+    assert client.is_closed
+    assert coordinator.http is None
+
+@pytest.mark.asyncio
+async def test_client_request_without_context_uses_plain_path(coordinator, test_user):
+    """Test requests without client context reuse process_request"""
+    request = CoordinationRequest(query="SEO trends?", use_client_context=False)
+    response = await coordinator.process_request_with_client(request, test_user)
+
+    assert response.client_context_used is False
+    assert len(coordinator._response_cache) == 1
+    assert all(r.metadata is None for r in response.agent_responses)
+
+@pytest.mark.asyncio
+async def test_client_request_with_context(coordinator, test_user, monkeypatch):
+    """Test requests with client context go through the context-aware agents"""
+    async def load_client_context(self, client_id, user):
+        return ClientContext(client_id=client_id)
+
+    monkeypatch.setattr(AgentCoordinator, "_load_client_context", load_client_context)
+    request = CoordinationRequest(
+        query="SEO trends?", client_id="promise_money", use_client_context=True
+    )
+    response = await coordinator.process_request_with_client(request, test_user)
+
+    assert response.client_context_used is True
+    assert all(r.metadata == {"client_context_used": True} for r in response.agent_responses)
+
+def test_routing_prefers_least_loaded_agent(coordinator, test_request):
+    """Test routing picks the agent with the lowest load ratio"""
+    coordinator.agents["content_research_agent"].current_load = 50
+    coordinator.agents["technical_seo_agent"].current_load = 10
+
+    decision = coordinator._route_request(test_request)
+    assert [a["id"] for a in decision["selected_agents"]] == ["technical_seo_agent"]
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_spread_across_agents(coordinator, test_user):
+    """Test load is held from routing until the call ends, so concurrent requests spread out"""
+    requests = [CoordinationRequest(query=f"SEO question {i}") for i in range(10)]
+    responses = await asyncio.gather(
+        *(coordinator.process_request(request, test_user) for request in requests)
+    )
+
+    routed = [r.routing_decision["selected_agents"][0]["id"] for r in responses]
+    assert routed.count("content_research_agent") == 5
+    assert routed.count("technical_seo_agent") == 5
+    assert all(a.current_load == 0 for a in coordinator.agents.values())
+
+def test_routing_holds_load_until_released(coordinator, test_request):
+    """Test routing takes the agent's load and ties go to either agent"""
+    decision = coordinator._route_request(test_request)
+    agent_id = decision["selected_agents"][0]["id"]
+    assert coordinator.agents[agent_id].current_load == 1
+
+    coordinator._release_routed(decision["selected_agents"])
+    picks = set()
+    for _ in range(50):
+        decision = coordinator._route_request(test_request)
+        picks.add(decision["selected_agents"][0]["id"])
+        coordinator._release_routed(decision["selected_agents"])
+    assert picks == set(coordinator.agents)
+
+def test_routing_honours_preferred_agents(coordinator):
+    """Test preferred agent types win over load, falling back when unavailable"""
+    coordinator.agents["technical_seo_agent"].current_load = 50
+    request = CoordinationRequest(query="Audit my site", preferred_agents=["technical_seo"])
+
+    decision = coordinator._route_request(request)
+    assert [a["id"] for a in decision["selected_agents"]] == ["technical_seo_agent"]
+
+    request = CoordinationRequest(query="Plan my project", preferred_agents=["project_planning"])
+    decision = coordinator._route_request(request)
+    assert [a["id"] for a in decision["selected_agents"]] == ["content_research_agent"]
+
+def test_routing_decision_excludes_agent_state(coordinator, test_request):
+    """Test routing hands out identity views rather than live agent dicts"""
+    agent = coordinator._route_request(test_request)["selected_agents"][0]
+    assert set(agent) == {"id", "type"}
+
+def test_routing_skips_agents_at_capacity(coordinator, test_request):
+    """Test routing fails cleanly when every agent is full"""
+    for agent_id, agent in coordinator.agents.items():
+        agent.current_load = agent.max_capacity - 1
+        coordinator._acquire(agent_id)
+
+    with pytest.raises(RuntimeError):
+        coordinator._route_request(test_request)
+
 if __name__ == "__main__":
     pytest.main([__file__])
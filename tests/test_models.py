@@ -0,0 +1,154 @@
+"""
+Tests for the data models
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone
+from src.models import (
+    AGENT_STATUS_LIST,
+    AgentRecord,
+    AgentResponse,
+    CoordinationRequest,
+    MultiAgentWorkflow,
+    AgentStatus,
+    CoordinationResponse,
+    QualityMetrics,
+    SystemHealth
+)
+
+def agent_response_fields():
+    return {
+        "agent_id": "content_research",
+        "agent_type": "content_research",
+        "response": "Simulated response",
+        "confidence": 0.9,
+        "processing_time": 0.4
+    }
+
+def agent_status_fields():
+    return {
+        "agent_id": "content_research_agent",
+        "agent_type": "content_research",
+        "status": "healthy",
+        "last_health_check_ms": 1704110400000,
+        "current_load": 0,
+        "max_capacity": 100,
+        "average_response_time": 0.5,
+        "success_rate": 0.95,
+        "version": "1.0.0",
+        "endpoint_url": "http://content-research-agent/api"
+    }
+
+def coordination_response_fields():
+    return {
+        "request_id": "abc123",
+        "routing_decision": {"selected_agents": [], "reasoning": "Least-loaded healthy agent."},
+        "agent_responses": [AgentResponse.model_validate(agent_response_fields())],
+        "synthesized_response": "Synthesized Response: \nSimulated response",
+        "total_processing_time": 1.2,
+        "quality_score": 0.8
+    }
+
+@pytest.mark.parametrize("model, fields", [
+    (AgentResponse, agent_response_fields()),
+    (AgentStatus, agent_status_fields()),
+    (CoordinationResponse, coordination_response_fields()),
+    (CoordinationResponse, {**coordination_response_fields(), "client_context_used": True}),
+    (SystemHealth, {
+        "status": "healthy",
+        "timestamp_ms": 1704110400000,
+        "agents": [AgentStatus.model_validate(agent_status_fields())],
+        "active_requests": 0,
+        "total_requests_today": 10,
+        "average_response_time": 0.5,
+        "system_load": 0.3,
+        "uptime_percentage": 99.9
+    }),
+    (QualityMetrics, {
+        "response_accuracy": 0.9,
+        "user_satisfaction": 4.2,
+        "sla_compliance": 0.99,
+        "error_rate": 0.01,
+        "recommendation_acceptance": 0.8
+    }),
+])
+def test_build_matches_validation(model, fields):
+    """Test unvalidated construction serializes the same as validated construction"""
+    constructed = model.build(**fields)
+    validated = model.model_validate(fields)
+
+    assert constructed.model_dump() == validated.model_dump()
+    assert json.loads(constructed.model_dump_json()) == json.loads(validated.model_dump_json())
+
+def test_agent_record_is_slotted():
+    """Test agent records reject attributes outside their fields"""
+    record = AgentRecord(
+        id="technical_seo_agent",
+        type="technical_seo",
+        status="healthy",
+        endpoint="http://technical-seo-agent/api",
+        last_health_check_ms=1704067200000
+    )
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+def test_coordination_request_validates_tags():
+    """Test priority and agent tags only accept their literal values"""
+    request = CoordinationRequest(query="SEO trends?", preferred_agents=["technical_seo"])
+    assert request.priority == "medium"
+
+    with pytest.raises(ValueError):
+        CoordinationRequest(query="SEO trends?", priority="critical")
+
+def test_outbound_models_are_frozen():
+    """Test outbound models reject mutation and unknown fields"""
+    response = AgentResponse.model_validate(agent_response_fields())
+    with pytest.raises(ValueError):
+        response.confidence = 0.1
+    with pytest.raises(ValueError):
+        AgentResponse.model_validate({**agent_response_fields(), "extra": 1})
+
+def workflow(steps):
+    return MultiAgentWorkflow(
+        workflow_id="wf-1",
+        name="Launch",
+        description="Launch content",
+        steps=[
+            {"step_id": step_id, "agent_type": "content_research", "agent_id": "content_research_agent",
+             "depends_on": depends_on, "parameters": {}, "estimated_duration": 1.0}
+            for step_id, depends_on in steps
+        ],
+        total_estimated_duration=float(len(steps)),
+        created_at=datetime(2024, 1, 1),
+        created_by="test-123"
+    )
+
+def test_workflow_columnar_dependency_order():
+    """Test columnar steps are ordered after their dependencies"""
+    columnar = workflow([("publish", ["draft", "seo"]), ("draft", ["research"]), ("seo", None), ("research", None)]).to_columnar()
+
+    assert columnar.step_ids == ["publish", "draft", "seo", "research"]
+    assert columnar.depends_on[2] == []
+    order = columnar.dependency_order()
+    assert order.index("research") < order.index("draft") < order.index("publish")
+    assert order.index("seo") < order.index("publish")
+
+def test_workflow_columnar_rejects_cycles():
+    """Test dependency cycles are reported instead of dropped"""
+    with pytest.raises(ValueError):
+        workflow([("a", ["b"]), ("b", ["a"])]).to_columnar().dependency_order()
+
+def test_agent_status_list_adapter_round_trip():
+    """Test the shared list adapter serializes statuses like the model itself"""
+    statuses = [AgentStatus.build(**agent_status_fields())] * 2
+    payload = AGENT_STATUS_LIST.dump_json(statuses)
+
+    assert json.loads(payload) == [json.loads(statuses[0].model_dump_json())] * 2
+    assert AGENT_STATUS_LIST.validate_json(payload)[0].agent_id == statuses[0].agent_id
+
+def test_epoch_ms_fields_expose_datetimes():
+    """Test epoch-millisecond wire fields convert back to UTC datetimes"""
+    status = AgentStatus.model_validate(agent_status_fields())
+    assert status.last_health_check == datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert json.loads(status.model_dump_json())["last_health_check_ms"] == 1704110400000